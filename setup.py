@@ -8,6 +8,9 @@ requirements = [
 ]
 
 extras_require = {
+    'http2': [
+        'httpx[http2,brotli,zstd]>=0.27.1,<1',
+    ],
     'docs': [
         'sphinx==4.4.0',
         'sphinxcontrib_trio==1.1.2',
@@ -0,0 +1,136 @@
+import unittest
+
+from willofsteel.alerts import AlertEngine
+from willofsteel.types import ItemType, MarketOrder
+
+
+def book(order_type, *orders):
+    return [
+        MarketOrder(f"order-{index}", "LOOT_TOKEN", order_type, price, amount)
+        for index, (price, amount) in enumerate(orders)
+    ]
+
+
+def sell(*prices):
+    return book("sell", *((price, 1) for price in prices))
+
+
+def buy(*amounts):
+    return book("buy", *((10, amount) for amount in amounts))
+
+
+class AlertEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = AlertEngine()
+        self.fired = []
+
+    def callback(self, rule, value):
+        self.fired.append((rule.metric, rule.condition, rule.threshold, value))
+
+    def take(self):
+        fired, self.fired = self.fired, []
+        return fired
+
+    def test_price_below(self):
+        self.engine.add_rule(ItemType.LOOT_TOKEN, "sell", "price", "below", 100, self.callback)
+        self.engine.update("LOOT_TOKEN", "sell", sell(120, 150))
+        self.assertEqual(self.take(), [])
+        self.engine.update("LOOT_TOKEN", "sell", sell(95, 150))
+        self.assertEqual(self.take(), [("price", "below", 100, 95)])
+
+    def test_price_above_uses_best_buy(self):
+        self.engine.add_rule("LOOT_TOKEN", "buy", "price", "above", 50, self.callback)
+        self.engine.update("LOOT_TOKEN", "buy", book("buy", (40, 1), (45, 1)))
+        self.engine.update("LOOT_TOKEN", "buy", book("buy", (40, 1), (60, 1)))
+        self.assertEqual(self.take(), [("price", "above", 50, 60)])
+
+    def test_depth(self):
+        self.engine.add_rule("LOOT_TOKEN", "buy", "depth", "above", 20, self.callback)
+        self.engine.add_rule("LOOT_TOKEN", "buy", "depth", "below", 5, self.callback)
+        self.engine.update("LOOT_TOKEN", "buy", buy(5, 5))
+        self.assertEqual(self.take(), [])
+        self.engine.update("LOOT_TOKEN", "buy", buy(15, 10))
+        self.assertEqual(self.take(), [("depth", "above", 20, 25)])
+        self.engine.update("LOOT_TOKEN", "buy", buy(3))
+        self.assertEqual(self.take(), [("depth", "below", 5, 3)])
+
+    def test_fires_once_until_rearmed(self):
+        self.engine.add_rule("LOOT_TOKEN", "sell", "price", "below", 100, self.callback, hysteresis=10)
+        for price in (90, 80, 95, 105):
+            self.engine.update("LOOT_TOKEN", "sell", sell(price))
+        self.assertEqual(self.take(), [("price", "below", 100, 90)])
+
+        # 105 is not far enough back to re-arm, 110 is.
+        self.engine.update("LOOT_TOKEN", "sell", sell(99))
+        self.assertEqual(self.take(), [])
+        self.engine.update("LOOT_TOKEN", "sell", sell(110))
+        self.engine.update("LOOT_TOKEN", "sell", sell(99))
+        self.assertEqual(self.take(), [("price", "below", 100, 99)])
+
+    def test_above_rearms_after_hysteresis(self):
+        self.engine.add_rule("LOOT_TOKEN", "buy", "depth", "above", 20, self.callback, hysteresis=5)
+        for depth in (25, 16, 21, 15, 21):
+            self.engine.update("LOOT_TOKEN", "buy", buy(depth))
+        self.assertEqual(self.take(), [("depth", "above", 20, 25), ("depth", "above", 20, 21)])
+
+    def test_only_crossed_rules_fire(self):
+        for threshold in (50, 80, 100, 120):
+            self.engine.add_rule("LOOT_TOKEN", "sell", "price", "below", threshold, self.callback)
+        self.engine.update("LOOT_TOKEN", "sell", sell(130))
+        self.engine.update("LOOT_TOKEN", "sell", sell(90))
+        self.assertEqual(sorted(self.take()), [("price", "below", 100, 90), ("price", "below", 120, 90)])
+
+    def test_empty_book_keeps_last_price(self):
+        self.engine.add_rule("LOOT_TOKEN", "sell", "price", "below", 100, self.callback)
+        self.engine.update("LOOT_TOKEN", "sell", sell(120))
+        self.engine.update("LOOT_TOKEN", "sell", [])
+        self.engine.update("LOOT_TOKEN", "sell", sell(110))
+        self.assertEqual(self.take(), [])
+
+    def test_add_rule_fires_immediately(self):
+        self.engine.update("LOOT_TOKEN", "sell", sell(90))
+        self.engine.add_rule("LOOT_TOKEN", "sell", "price", "below", 100, self.callback)
+        self.engine.add_rule("LOOT_TOKEN", "sell", "price", "below", 80, self.callback)
+        self.assertEqual(self.take(), [("price", "below", 100, 90)])
+
+    def test_value_recorded_without_rules(self):
+        rule = self.engine.add_rule("LOOT_TOKEN", "sell", "price", "below", 100, self.callback)
+        self.engine.update("LOOT_TOKEN", "sell", sell(150))
+        self.engine.remove_rule(rule)
+        self.engine.update("LOOT_TOKEN", "sell", sell(50))
+        self.engine.update("LOOT_TOKEN", "sell", sell(200))
+
+        self.engine.add_rule("LOOT_TOKEN", "sell", "price", "below", 180, self.callback)
+        self.assertEqual(self.take(), [])
+        self.engine.update("LOOT_TOKEN", "sell", sell(170))
+        self.assertEqual(self.take(), [("price", "below", 180, 170)])
+
+    def test_remove_rules_from_callback(self):
+        rules = []
+
+        def one_shot(rule, value):
+            self.callback(rule, value)
+            while rules:
+                self.engine.remove_rule(rules.pop())
+
+        rules.extend(
+            self.engine.add_rule("LOOT_TOKEN", "sell", "price", condition, threshold, one_shot)
+            for condition, threshold in (("below", 100), ("below", 90), ("below", 80), ("above", 10))
+        )
+        self.engine.update("LOOT_TOKEN", "sell", sell(50))
+        self.assertEqual(len(self.take()), 1)
+        self.engine.update("LOOT_TOKEN", "sell", sell(200))
+        self.engine.update("LOOT_TOKEN", "sell", sell(50))
+        self.assertEqual(self.take(), [])
+
+    def test_remove_rule(self):
+        rule = self.engine.add_rule("LOOT_TOKEN", "sell", "price", "below", 100, self.callback)
+        self.engine.remove_rule(rule)
+        self.engine.update("LOOT_TOKEN", "sell", sell(50))
+        self.assertEqual(self.take(), [])
+        with self.assertRaises(KeyError):
+            self.engine.remove_rule(rule)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import itertools
+import multiprocessing
+import time
+import unittest
+from unittest import mock
+
+from willofsteel.exceptions import InvalidKey
+from willofsteel.fleet import FleetScanner, ShardProgress
+from willofsteel.types import ItemType, Player, UnitType
+
+
+class FakeClient:
+    """Stands in for :class:`Client` inside the forked workers."""
+
+    delay = 0.0
+
+    def __init__(self, api_key, logger=None, session=None):
+        if api_key.startswith("bad"):
+            raise InvalidKey
+        self.api_key = api_key
+        time.sleep(self.delay)
+
+    def get_player(self):
+        return Player.from_response({"user_id": len(self.api_key), "registered_at": "2024-01-01", "gold": 10 * len(self.api_key)})
+
+    def get_player_army(self):
+        return {UnitType.KINGS_GUARDS: len(self.api_key), UnitType.INFANTRY: 5}
+
+    def get_player_inventory(self):
+        return {ItemType.LOOT_TOKEN: 2}
+
+
+class SlowFakeClient(FakeClient):
+    delay = 0.05
+
+
+def broken_chunk(shard, api_keys):
+    raise RuntimeError("worker failed")
+
+
+# The fake is picked up by the workers because they are forked after the patch.
+@unittest.skipUnless(multiprocessing.get_start_method() == "fork", "requires forked worker processes")
+class FleetScannerTest(unittest.TestCase):
+    def test_snapshot(self):
+        keys = [f"key-{index}" for index in range(10)] + ["bad-1", "bad-2"]
+        progress = []
+        with mock.patch("willofsteel.fleet.Client", FakeClient):
+            snapshot = FleetScanner(keys, processes=3, chunk_size=2).scan(on_progress=progress.append)
+
+        good = [key for key in keys if not key.startswith("bad")]
+        self.assertEqual(sorted(snapshot.players), sorted(good))
+        self.assertEqual(snapshot.players["key-1"].gold, 50)
+        self.assertEqual(snapshot.armies["key-9"], {UnitType.KINGS_GUARDS: 5, UnitType.INFANTRY: 5})
+        self.assertEqual(snapshot.inventories["key-3"], {ItemType.LOOT_TOKEN: 2})
+
+        self.assertEqual(set(snapshot.errors), {"bad-1", "bad-2"})
+        self.assertTrue(snapshot.errors["bad-1"].startswith("InvalidKey:"))
+
+        self.assertEqual(sorted(snapshot.shards), [0, 1, 2])
+        self.assertEqual(sum(shard.total for shard in snapshot.shards.values()), len(keys))
+        for shard in snapshot.shards.values():
+            self.assertEqual(shard.completed, shard.total)
+        self.assertEqual(sum(shard.errors for shard in snapshot.shards.values()), 2)
+        self.assertTrue(all(isinstance(update, ShardProgress) for update in progress))
+
+    def test_failed_chunk_is_recorded_per_key(self):
+        # The pool is created after the patch, so the workers run ``broken_chunk``.
+        with mock.patch("willofsteel.fleet._scan_chunk", broken_chunk):
+            snapshot = FleetScanner(["a", "b", "c"], processes=1, chunk_size=2).scan()
+
+        self.assertEqual(snapshot.players, {})
+        self.assertEqual(snapshot.errors, {key: "RuntimeError: worker failed" for key in "abc"})
+        self.assertEqual(snapshot.shards[0], ShardProgress(0, 3, 3, 3))
+
+    def test_early_stop(self):
+        keys = [f"key-{index}" for index in range(200)]
+        with mock.patch("willofsteel.fleet.Client", SlowFakeClient):
+            started = time.monotonic()
+            results = list(itertools.islice(FleetScanner(keys, processes=2, chunk_size=1).iter_scan(), 3))
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(len(results), 3)
+        # Scanning all 200 keys would take about 5 seconds.
+        self.assertLess(elapsed, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+
+from willofsteel.exceptions import DeadlineExceeded
+from willofsteel.scheduler import Priority, RequestScheduler
+
+
+class RequestSchedulerTest(unittest.TestCase):
+    def test_priority_order(self):
+        order = []
+        gate = threading.Event()
+        with RequestScheduler(workers=1) as scheduler:
+            scheduler.submit(gate.wait, priority=Priority.CRITICAL)
+            futures = [
+                scheduler.submit(order.append, priority, priority=priority)
+                for priority in (Priority.BULK, Priority.NORMAL, Priority.CRITICAL, Priority.HIGH)
+            ]
+            gate.set()
+            for future in futures:
+                future.result(1)
+        self.assertEqual(order, [Priority.CRITICAL, Priority.HIGH, Priority.NORMAL, Priority.BULK])
+
+    def test_expires_while_saturated(self):
+        scheduler = RequestScheduler(workers=1)
+        try:
+            stop = time.monotonic() + 0.5
+
+            def critical():
+                time.sleep(0.01)
+                if time.monotonic() < stop:
+                    scheduler.submit(critical, priority=Priority.CRITICAL)
+
+            scheduler.submit(critical, priority=Priority.CRITICAL)
+            bulk = scheduler.submit(lambda: None, priority=Priority.BULK, deadline=0.05)
+
+            # The pipeline stays busy with critical work, yet the bulk job is
+            # dropped as soon as its deadline passes.
+            with self.assertRaises(DeadlineExceeded):
+                bulk.result(0.3)
+            stats = scheduler.stats()[Priority.BULK]
+            self.assertEqual((stats.queued, stats.started, stats.dropped), (0, 0, 1))
+            self.assertLessEqual(scheduler.queue_depth, 1)
+        finally:
+            scheduler.close()
+
+    def test_expired_jobs_do_not_use_rate_slots(self):
+        with RequestScheduler(workers=1, rate=20) as scheduler:
+            gate = threading.Event()
+            scheduler.submit(gate.wait, priority=Priority.CRITICAL)
+            time.sleep(0.01)
+            stale = [scheduler.submit(lambda: None, deadline=0.01) for _ in range(10)]
+            time.sleep(0.05)
+            gate.set()
+            started = time.monotonic()
+            scheduler.submit(lambda: None).result(1)
+            # Only one rate slot (1/20s) may be waited for, not one per stale job.
+            self.assertLess(time.monotonic() - started, 0.2)
+        for future in stale:
+            self.assertIsInstance(future.exception(), DeadlineExceeded)
+        self.assertEqual(scheduler.stats()[Priority.NORMAL].dropped, 10)
+
+    def test_close_cancels_pending(self):
+        gate = threading.Event()
+        scheduler = RequestScheduler(workers=1)
+        scheduler.submit(gate.wait, priority=Priority.CRITICAL)
+        time.sleep(0.01)
+        pending = scheduler.submit(lambda: None, deadline=10)
+        # Cancel while the worker is still blocked, then let it finish.
+        scheduler.close(wait=False, cancel_pending=True)
+        gate.set()
+        scheduler.close()
+        self.assertTrue(pending.cancelled())
+        self.assertEqual(scheduler.queue_depth, 0)
+        self.assertEqual(scheduler.stats()[Priority.NORMAL].queued, 0)
+        with self.assertRaises(RuntimeError):
+            scheduler.submit(lambda: None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+
+from willofsteel.exceptions import InvalidInput
+from willofsteel.fleet import FleetSnapshot
+from willofsteel.store import FleetStore
+from willofsteel.types import Alliance, ItemType, Player, UnitType
+
+
+def player(gold=0, queue_slots=0, **fields):
+    return Player.from_response({"user_id": 1, "registered_at": "2024-01-01", "gold": gold, "queue_slots": queue_slots, **fields})
+
+
+def alliance(name):
+    return Alliance(owner=1, created_at="2024-01-01", name=name, user_limit=10, bank=0)
+
+
+class FleetStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = FleetStore()
+
+    def test_player_ranges_and_totals(self):
+        for account, gold in (("a", 10), ("b", 50), ("c", 100), ("d", 50)):
+            self.store.update_player(account, player(gold=gold))
+
+        self.assertEqual(self.store.total("gold"), 210)
+        self.assertEqual(sorted(self.store.find(gold=(50, 100))), ["b", "c", "d"])
+        self.assertEqual(sorted(self.store.find(gold=(None, 50))), ["a", "b", "d"])
+        self.assertEqual(sorted(self.store.find(gold=(51, None))), ["c"])
+        self.assertEqual(self.store.find(gold=(101, None)), [])
+        self.assertEqual(self.store.find(gold=(60, 40)), [])
+        self.assertEqual(len(self.store.find()), 4)
+        with self.assertRaises(InvalidInput):
+            self.store.find(units=(1, None))
+        with self.assertRaises(InvalidInput):
+            self.store.total("name")
+
+    def test_player_update_replaces_old_entry(self):
+        self.store.update_player("a", player(gold=10))
+        self.store.update_player("b", player(gold=20))
+        self.store.update_player("a", player(gold=500))
+
+        self.assertEqual(self.store.total("gold"), 520)
+        self.assertEqual(self.store.find(gold=(None, 15)), [])
+        self.assertEqual(self.store.find(gold=(400, None)), ["a"])
+        self.assertEqual(self.store.player("a").gold, 500)
+        self.assertEqual(len(self.store), 2)
+
+    def test_invalid_player_is_rejected_before_indexing(self):
+        with self.assertRaises(InvalidInput):
+            self.store.update_player("a", player(gold=None))
+        self.assertNotIn("a", self.store)
+        self.assertEqual(self.store.total("gold"), 0)
+
+    def test_army_counts(self):
+        self.store.update_army("a", {UnitType.KINGS_GUARDS: 20, UnitType.INFANTRY: 5})
+        self.store.update_army("b", {})
+        self.store.update_army("c", {UnitType.KINGS_GUARDS: 5})
+
+        self.assertEqual(self.store.total_units(UnitType.KINGS_GUARDS), 25)
+        self.assertEqual(sorted(self.store.with_units(UnitType.KINGS_GUARDS, high=10)), ["b", "c"])
+        self.assertEqual(self.store.with_units(UnitType.KINGS_GUARDS, low=10), ["a"])
+        self.assertEqual(sorted(self.store.with_units(UnitType.CAVALRY, low=0, high=0)), ["a", "b", "c"])
+
+        self.store.update_army("a", {UnitType.INFANTRY: 1})
+        self.assertEqual(self.store.total_units(UnitType.KINGS_GUARDS), 5)
+        self.assertEqual(self.store.total_units(UnitType.INFANTRY), 1)
+        self.assertEqual(self.store.with_units(UnitType.KINGS_GUARDS, low=10), [])
+        self.assertEqual(self.store.army("a"), {UnitType.INFANTRY: 1})
+
+    def test_inventory_counts(self):
+        self.store.update_inventory("a", {ItemType.LOOT_TOKEN: 3})
+        self.store.update_inventory("b", {ItemType.LOOT_TOKEN: 1, ItemType.IRON_FRAME: 2})
+
+        self.assertEqual(self.store.total_items(ItemType.LOOT_TOKEN), 4)
+        self.assertEqual(self.store.with_items(ItemType.IRON_FRAME, high=0), ["a"])
+        self.assertEqual(self.store.with_items(ItemType.LOOT_TOKEN, 2, 3), ["a"])
+
+    def test_alliance_moves(self):
+        self.store.update_player("a", player(queue_slots=2))
+        self.store.update_player("b", player(queue_slots=0))
+        self.store.update_player("c", player(queue_slots=1))
+        self.store.update_alliance("a", alliance("Knights"))
+        self.store.update_alliance("b", alliance("Knights"))
+        self.store.update_alliance("c", alliance("Rooks"))
+
+        self.assertEqual(sorted(self.store.find(alliance="Knights")), ["a", "b"])
+        self.assertEqual(self.store.find(alliance="Knights", queue_slots=(1, None)), ["a"])
+
+        self.store.update_alliance("a", alliance("Rooks"))
+        self.store.update_alliance("b", None)
+        self.assertEqual(self.store.find(alliance="Knights"), [])
+        self.assertEqual(sorted(self.store.find(alliance="Rooks", queue_slots=(1, None))), ["a", "c"])
+        self.assertIsNone(self.store.alliance("b"))
+
+    def test_find_uses_every_condition(self):
+        for index in range(20):
+            self.store.update_player(index, player(gold=index * 10, queue_slots=index % 3))
+            self.store.update_alliance(index, alliance("Even" if index % 2 == 0 else "Odd"))
+
+        expected = [index for index in range(20) if index % 2 == 0 and index * 10 >= 100 and index % 3 >= 1]
+        self.assertEqual(sorted(self.store.find(alliance="Even", gold=(100, None), queue_slots=(1, None))), expected)
+        # A very selective range is used to pick the candidates.
+        self.assertEqual(self.store.find(alliance="Even", gold=(40, 40)), [4])
+        self.assertEqual(self.store.find(alliance="Odd", gold=(40, 40)), [])
+
+    def test_remove(self):
+        self.store.update_player("a", player(gold=10))
+        self.store.update_army("a", {UnitType.INFANTRY: 4})
+        self.store.update_inventory("a", {ItemType.LOOT_TOKEN: 2})
+        self.store.update_alliance("a", alliance("Knights"))
+        self.store.update_player("b", player(gold=5))
+
+        self.store.remove("a")
+        self.assertNotIn("a", self.store)
+        self.assertEqual(self.store.total("gold"), 5)
+        self.assertEqual(self.store.total_units(UnitType.INFANTRY), 0)
+        self.assertEqual(self.store.total_items(ItemType.LOOT_TOKEN), 0)
+        self.assertEqual(self.store.with_units(UnitType.INFANTRY), [])
+        self.assertEqual(self.store.find(alliance="Knights"), [])
+        self.assertIsNone(self.store.player("a"))
+
+        with self.assertRaises(KeyError):
+            self.store.remove("unknown")
+        self.assertNotIn("unknown", self.store)
+
+    def test_ingest_snapshot(self):
+        snapshot = FleetSnapshot(
+            players={"a": player(gold=7)},
+            armies={"a": {UnitType.BOWMEN: 3}},
+            inventories={"a": {}},
+            errors={"b": "InvalidKey"},
+            shards={},
+        )
+        self.store.ingest(snapshot)
+        self.assertEqual(self.store.total("gold"), 7)
+        self.assertEqual(self.store.total_units(UnitType.BOWMEN), 3)
+        self.assertEqual(self.store.with_items(ItemType.LOOT_TOKEN, high=0), ["a"])
+        self.assertNotIn("b", self.store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import gzip
+import json
+import socket
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import httpx  # noqa: F401
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+except ImportError:
+    serve = None
+
+import willofsteel
+from willofsteel.transport import HTTP2Transport
+
+
+ORDERS = {
+    f"order-{index}": {"item_type": "LOOT_TOKEN", "order_type": "sell", "price": 100 + index, "amount": 1}
+    for index in range(200)
+}
+
+
+class _Server:
+    """A local cleartext h2 server which gzips /market responses."""
+
+    def __init__(self):
+        self.connections = set()
+        self.http_versions = set()
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def app(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        self.connections.add(tuple(scope["client"]))
+        self.http_versions.add(scope["http_version"])
+        headers = dict(scope["headers"])
+        body = b"{}"
+        response_headers = [(b"content-type", b"application/json")]
+        if scope["path"] == "/market":
+            # Give the other threads time to open streams on the same connection.
+            await asyncio.sleep(0.05)
+            body = json.dumps({"orders": ORDERS}).encode()
+            if b"gzip" in headers.get(b"accept-encoding", b""):
+                body = gzip.compress(body)
+                response_headers.append((b"content-encoding", b"gzip"))
+        await send({"type": "http.response.start", "status": 200, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        config = Config()
+        config.bind = [f"127.0.0.1:{self.port}"]
+        config.accesslog = None
+        config.errorlog = None
+        self._shutdown = asyncio.Event()
+
+        async def main():
+            self._started.set()
+            await serve(self.app, config, shutdown_trigger=self._shutdown.wait)
+
+        self._loop.run_until_complete(main())
+
+    def __enter__(self):
+        self._thread.start()
+        self._started.wait()
+        # Wait until the socket accepts connections.
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.1).close()
+                break
+            except OSError:
+                threading.Event().wait(0.05)
+        return self
+
+    def __exit__(self, *args):
+        self._loop.call_soon_threadsafe(self._shutdown.set)
+        self._thread.join(5)
+
+
+@unittest.skipIf(serve is None, "requires the http2 extra and hypercorn")
+class HTTP2TransportTest(unittest.TestCase):
+    def test_multiplexed_compressed_requests(self):
+        with _Server() as server, HTTP2Transport(base_url=f"http://127.0.0.1:{server.port}", http1=False) as transport:
+            client = willofsteel.Client("key", session=transport)
+            response = transport.request("GET", willofsteel.constants.BASE + "/verify")
+            self.assertEqual(response.http_version, "HTTP/2")
+
+            with ThreadPoolExecutor(8) as executor:
+                results = list(executor.map(lambda _: client.get_offer("sell", "LOOT_TOKEN"), range(8)))
+            streamed = list(client.iter_offer("sell", "LOOT_TOKEN", chunk_size=256))
+
+            for orders in results + [streamed]:
+                self.assertEqual(len(orders), len(ORDERS))
+            self.assertEqual(server.http_versions, {"2"})
+            self.assertEqual(len(server.connections), 1)
+
+            stats = transport.stats
+            self.assertEqual(stats.requests, 11)
+            self.assertGreater(stats.bytes_saved, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
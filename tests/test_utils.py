@@ -0,0 +1,159 @@
+import io
+import json
+import logging
+import logging.handlers
+import threading
+import unittest
+
+from willofsteel import utils
+from willofsteel.types import LoggingObject
+from willofsteel.utils import iter_object_items, log_payload, setup_logging
+
+
+DOCUMENT = (
+    '{"n": 1.25, "e": 1e5, "neg": -3, "small": 2.5E-3, "zero": 0, "flags": [true, false, null],'
+    ' "meta": {"nested": [1, 2.0, {"x": -0.5e+2}], "name": "Loït \\"token\\""},'
+    ' "orders": {'
+    '"a1": {"item_type": "LOOT_TOKEN", "order_type": "sell", "price": 120, "amount": 3},'
+    ' "b2": {"item_type": "LOOT_TOKEN", "order_type": "sell", "price": 99.5, "amount": 1e2},'
+    ' "c3": {"item_type": "LOOT_TOKEN", "order_type": "sell", "price": -1, "amount": 7}'
+    '}, "tail": 12345}'
+).encode()
+
+
+def split(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class IterObjectItemsTest(unittest.TestCase):
+    def test_every_chunk_size(self):
+        expected = list(json.loads(DOCUMENT)["orders"].items())
+        for size in range(1, len(DOCUMENT) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_object_items(split(DOCUMENT, size), "orders")), expected)
+
+    def test_every_split_point(self):
+        expected = list(json.loads(DOCUMENT)["orders"].items())
+        for index in range(len(DOCUMENT) + 1):
+            with self.subTest(index=index):
+                chunks = [DOCUMENT[:index], DOCUMENT[index:]]
+                self.assertEqual(list(iter_object_items(chunks, "orders")), expected)
+
+    def test_numbers_split_inside_fraction_and_exponent(self):
+        chunks = [b'{"a": 1e', b'5, "b": 2.', b'5, "orders": {"x": 2.', b'0, "y": 3E', b'-', b'1}}']
+        self.assertEqual(list(iter_object_items(chunks, "orders")), [("x", 2.0), ("y", 0.3)])
+
+    def test_number_at_end_of_document(self):
+        self.assertEqual(list(iter_object_items([b'{"orders": {"x": 1', b'2', b'}}'], "orders")), [("x", 12)])
+        self.assertEqual(list(iter_object_items([b'{"orders": {}, "n": 4', b'2}'], "orders")), [])
+
+    def test_empty_and_missing_object(self):
+        self.assertEqual(list(iter_object_items([b'{"orders": {}}'], "orders")), [])
+        self.assertEqual(list(iter_object_items([b'{"detail": "x"}'], "orders")), [])
+
+    def test_stops_reading_after_object(self):
+        chunks = iter([b'{"orders": {"x": 1}', b', "rest": ', b'"unread"}'])
+        self.assertEqual(list(iter_object_items(chunks, "orders")), [("x", 1)])
+        self.assertEqual(next(chunks), b', "rest": ')
+
+    def test_invalid_document(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_object_items([b'{"orders": {"x": 1 2}}'], "orders"))
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_object_items([b'{"orders": {"x": 1'], "orders"))
+
+
+class _Payload:
+    """Counts how often it is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "payload"
+
+
+class SetupLoggingTest(unittest.TestCase):
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.library = logging.getLogger("willofsteel")
+        self.saved = [(logger, logger.level, list(logger.handlers)) for logger in (self.root, self.library)]
+        self.saved_installed = dict(utils._installed)
+        self.saved_rate = utils._payload_sample_rate
+        utils._installed.clear()
+
+    def tearDown(self):
+        for _, _, listener in utils._installed.values():
+            if listener is not None:
+                listener.stop()
+        utils._installed.clear()
+        utils._installed.update(self.saved_installed)
+        utils._payload_sample_rate = self.saved_rate
+        for logger, level, handlers in self.saved:
+            logger.setLevel(level)
+            logger.handlers[:] = handlers
+
+    def added_handlers(self, logger):
+        saved = next(handlers for saved_logger, _, handlers in self.saved if saved_logger is logger)
+        return [handler for handler in logger.handlers if handler not in saved]
+
+    def test_installs_once(self):
+        for _ in range(5):
+            setup_logging(LoggingObject())
+        self.assertEqual(len(self.added_handlers(self.root)), 1)
+
+    def test_different_config_replaces_handler(self):
+        first = logging.StreamHandler(io.StringIO())
+        second = logging.StreamHandler(io.StringIO())
+        setup_logging(LoggingObject(handler=first))
+        setup_logging(LoggingObject(handler=second))
+        self.assertEqual(self.added_handlers(self.root), [second])
+
+        # The library logger is configured on its own.
+        library = logging.StreamHandler(io.StringIO())
+        setup_logging(LoggingObject(handler=library, root=False))
+        self.assertEqual(self.added_handlers(self.root), [second])
+        self.assertEqual(self.added_handlers(self.library), [library])
+
+    def test_queue_mode(self):
+        stream = io.StringIO()
+        threads = []
+
+        class Formatter(logging.Formatter):
+            def format(self, record):
+                threads.append(threading.current_thread())
+                return super().format(record)
+
+        setup_logging(LoggingObject(handler=logging.StreamHandler(stream), formatter=Formatter("%(message)s"), queue=True))
+        handlers = self.added_handlers(self.root)
+        self.assertEqual(len(handlers), 1)
+        self.assertIsInstance(handlers[0], logging.handlers.QueueHandler)
+
+        logging.info("queued %s", "message")
+        _, _, listener = utils._installed[self.root]
+        listener.stop()
+        utils._installed[self.root] = (None, handlers[0], None)
+
+        self.assertEqual(stream.getvalue(), "queued message\n")
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_payload_not_formatted_below_debug(self):
+        setup_logging(LoggingObject(handler=logging.StreamHandler(io.StringIO()), level=logging.INFO))
+        payload = _Payload()
+        for _ in range(10):
+            log_payload("Got data: %s", payload)
+        self.assertEqual(payload.formatted, 0)
+
+    def test_payload_sampling(self):
+        stream = io.StringIO()
+        setup_logging(LoggingObject(handler=logging.StreamHandler(stream), level=logging.DEBUG, payload_sample_rate=3))
+        payload = _Payload()
+        for _ in range(9):
+            log_payload("Got data: %s", payload)
+        self.assertEqual(stream.getvalue().count("Got data: payload"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,4 +16,9 @@ __copyright__ = "Copyright 2024-present ItsNeil"
 __version__ = "0.0.1a"
 
 from .client import *
-from .types import *
\ No newline at end of file
+from .types import *
+from .fleet import *
+from .alerts import *
+from .store import *
+from .transport import *
+from .scheduler import *
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+WillofSteel API Wrapper
+~~~~~~~~~~~~~~~~~~~~~~~
+
+A wrapper for the Will of Steel API
+
+:copyright: (C) 2024-present ItsNeil
+:license: MIT, see LICENSE for more details
+
+"""
+from __future__ import annotations
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+from math import inf
+from typing import Callable, Literal, NamedTuple, Optional, Union
+import logging
+
+from .types import ItemType, MarketOrder
+from .exceptions import InvalidInput
+
+__all__ = (
+    "AlertRule",
+    "AlertEngine",
+)
+
+
+class AlertRule(NamedTuple):
+    item_id: str
+    order_type: Literal["buy", "sell"]
+    metric: Literal["price", "depth"]
+    condition: Literal["below", "above"]
+    threshold: int
+    callback: Callable[[AlertRule, int], None]
+    hysteresis: int = 0
+
+
+def _best_price(order_type: str, orders: list[MarketOrder]) -> Optional[int]:
+    if not orders:
+        return None
+    if order_type == "sell":
+        return min(order.price for order in orders)
+    return max(order.price for order in orders)
+
+
+def _depth(order_type: str, orders: list[MarketOrder]) -> int:
+    return sum(order.amount for order in orders)
+
+
+_METRICS = {
+    "price": _best_price,
+    "depth": _depth,
+}
+
+
+class AlertEngine:
+    """
+    Evaluate price and depth alerts against market updates.
+
+    Rules are indexed by item, order type, metric and condition, and kept
+    sorted by threshold. An update only looks at the rules whose threshold
+    lies between the previous and the new value of a metric, so the cost
+    of an update does not grow with the total number of rules.
+
+    A rule fires once when its condition becomes true and is re-armed only
+    after the value moves back past the threshold by at least ``hysteresis``.
+
+    """
+    def __init__(self):
+        self._ids = count()
+        self._rules: dict[int, AlertRule] = {}
+        self._armed: dict[int, bool] = {}
+        # (item_id, order_type, metric, condition) -> sorted [(level, rule_id)]
+        self._fire_index: dict[tuple, list[tuple[int, int]]] = {}
+        self._rearm_index: dict[tuple, list[tuple[int, int]]] = {}
+        # (item_id, order_type, metric) -> last known value
+        self._values: dict[tuple, int] = {}
+
+    @staticmethod
+    def _rearm_level(rule: AlertRule) -> int:
+        if rule.condition == "below":
+            return rule.threshold + rule.hysteresis
+        return rule.threshold - rule.hysteresis
+
+    def add_rule(
+        self,
+        item_id: Union[ItemType, str],
+        order_type: Literal["buy", "sell"],
+        metric: Literal["price", "depth"],
+        condition: Literal["below", "above"],
+        threshold: int,
+        callback: Callable[[AlertRule, int], None],
+        hysteresis: int = 0,
+    ) -> int:
+        """
+        Add an alert rule.
+
+        Parameters
+        ----------
+        item_id: Union[:class:`~willofsteel.types.ItemType`, :class:`str`]
+            The item to watch.
+        order_type: :class:`Literal["buy", "sell"]`
+            The side of the market to watch.
+        metric: :class:`Literal["price", "depth"]`
+            ``price`` is the best price (lowest sell or highest buy) and
+            ``depth`` is the total amount on offer.
+        condition: :class:`Literal["below", "above"]`
+            Whether the rule fires when the metric drops below or rises above the threshold.
+        threshold: :class:`int`
+            The threshold to compare the metric against.
+        callback: Callable[[:class:`AlertRule`, :class:`int`], None]
+            Called with the rule and the current value when the rule fires.
+        hysteresis: :class:`int`
+            How far the value has to move back past the threshold before the
+            rule can fire again. Defaults to 0.
+
+        Returns
+        -------
+        :class:`int`
+            The ID of the rule, which can be passed to :meth:`remove_rule`.
+
+        """
+        if isinstance(item_id, ItemType):
+            item_id = item_id.item_id
+        if order_type not in ["buy", "sell"]:
+            raise InvalidInput("order_type")
+        if metric not in _METRICS:
+            raise InvalidInput("metric")
+        if condition not in ["below", "above"]:
+            raise InvalidInput("condition")
+        if hysteresis < 0:
+            raise InvalidInput("hysteresis")
+
+        rule = AlertRule(item_id, order_type, metric, condition, threshold, callback, hysteresis)
+        rule_id = next(self._ids)
+        self._rules[rule_id] = rule
+        self._armed[rule_id] = True
+
+        key = (item_id, order_type, metric, condition)
+        insort(self._fire_index.setdefault(key, []), (threshold, rule_id))
+        insort(self._rearm_index.setdefault(key, []), (self._rearm_level(rule), rule_id))
+
+        value = self._values.get((item_id, order_type, metric))
+        if value is not None and self._holds(rule, value):
+            self._fire(rule_id, value)
+        return rule_id
+
+    def remove_rule(self, rule_id: int) -> None:
+        """
+        Remove an alert rule.
+
+        Parameters
+        ----------
+        rule_id: :class:`int`
+            The ID returned by :meth:`add_rule`.
+
+        """
+        rule = self._rules.pop(rule_id)
+        del self._armed[rule_id]
+        key = (rule.item_id, rule.order_type, rule.metric, rule.condition)
+        for index, level in ((self._fire_index, rule.threshold), (self._rearm_index, self._rearm_level(rule))):
+            levels = index[key]
+            del levels[bisect_left(levels, (level, rule_id))]
+            if not levels:
+                del index[key]
+
+    def update(self, item_id: Union[ItemType, str], order_type: Literal["buy", "sell"], orders: list[MarketOrder]) -> None:
+        """
+        Feed the current order book of one item and side into the engine.
+
+        Parameters
+        ----------
+        item_id: Union[:class:`~willofsteel.types.ItemType`, :class:`str`]
+            The item the orders belong to.
+        order_type: :class:`Literal["buy", "sell"]`
+            The side of the market the orders belong to.
+        orders: list[:class:`~willofsteel.types.MarketOrder`]
+            The orders, as returned by :meth:`Client.get_offer`.
+
+        """
+        if isinstance(item_id, ItemType):
+            item_id = item_id.item_id
+        for metric, compute in _METRICS.items():
+            new = compute(order_type, orders)
+            if new is None:
+                # An empty book has no best price, keep the last known one.
+                continue
+            # The value is recorded even without rules, so that a rule added
+            # later is compared against the current book.
+            old = self._values.get((item_id, order_type, metric))
+            self._values[(item_id, order_type, metric)] = new
+            if old == new:
+                continue
+
+            self._update_below((item_id, order_type, metric, "below"), old, new)
+            self._update_above((item_id, order_type, metric, "above"), old, new)
+
+    def _update_below(self, key: tuple, old: Optional[int], new: int) -> None:
+        levels = self._fire_index.get(key)
+        if levels is None:
+            # There are no rules for this key, or an earlier callback removed them.
+            return
+        if old is None or new < old:
+            # Rules with old >= threshold > new may have just been crossed.
+            start = bisect_right(levels, (new, inf))
+            end = len(levels) if old is None else bisect_right(levels, (old, inf))
+            for _, rule_id in levels[start:end]:
+                # A callback may have removed rules from this range already.
+                if self._armed.get(rule_id):
+                    self._fire(rule_id, new)
+        else:
+            rearm = self._rearm_index[key]
+            start = bisect_right(rearm, (old, inf))
+            end = bisect_right(rearm, (new, inf))
+            for _, rule_id in rearm[start:end]:
+                if rule_id in self._armed:
+                    self._armed[rule_id] = True
+
+    def _update_above(self, key: tuple, old: Optional[int], new: int) -> None:
+        levels = self._fire_index.get(key)
+        if levels is None:
+            # There are no rules for this key, or an earlier callback removed them.
+            return
+        if old is None or new > old:
+            # Rules with old <= threshold < new may have just been crossed.
+            start = 0 if old is None else bisect_left(levels, (old, -inf))
+            end = bisect_left(levels, (new, -inf))
+            for _, rule_id in levels[start:end]:
+                # A callback may have removed rules from this range already.
+                if self._armed.get(rule_id):
+                    self._fire(rule_id, new)
+        else:
+            rearm = self._rearm_index[key]
+            start = bisect_left(rearm, (new, -inf))
+            end = bisect_left(rearm, (old, -inf))
+            for _, rule_id in rearm[start:end]:
+                if rule_id in self._armed:
+                    self._armed[rule_id] = True
+
+    @staticmethod
+    def _holds(rule: AlertRule, value: int) -> bool:
+        if rule.condition == "below":
+            return value < rule.threshold
+        return value > rule.threshold
+
+    def _fire(self, rule_id: int, value: int) -> None:
+        rule = self._rules.get(rule_id)
+        if rule is None:
+            return
+        self._armed[rule_id] = False
+        try:
+            rule.callback(rule, value)
+        except Exception:
+            logging.exception(f"Alert callback for {rule.item_id} {rule.order_type} {rule.metric} failed.")
@@ -9,18 +9,19 @@ A wrapper for the Will of Steel API
 
 """
 from __future__ import annotations
-from typing import Literal
+from typing import Iterator, Literal
 import requests
 import logging
 
 from .types import Player, Alliance, MarketOrder, UnitType, ItemType, LoggingObject, convert_str_to_IT, convert_str_to_UT, Outpost
 from .constants import BASE, ALL_ITEMS, MISSING
-from .utils import parse_error, setup_logging
+from .utils import parse_error, setup_logging, iter_object_items, log_payload
 from .exceptions import *
 
 class Client:
-    def __init__(self, api_key: str, logger: LoggingObject = MISSING):
+    def __init__(self, api_key: str, logger: LoggingObject = MISSING, session: requests.Session = MISSING):
         self.api_key = api_key
+        self.session = session
         self.headers = {
             "API-Key": self.api_key,
             "User-Agent": "Will of Steel API Wrapper",
@@ -49,7 +50,7 @@ class Client:
         # There can not be a 403 error raised as we already verified the key.
         if response.status == 200:
             data = response.json()
-            logging.debug(f"Got player data successfully: {data}. Returning with converting to Model.")
+            log_payload("Got player data successfully: %s. Returning with converting to Model.", data)
             return Player.from_response(data)
 
     def get_player_inventory(self) -> dict[ItemType, int]:
@@ -60,7 +61,7 @@ class Client:
         response = self.request("GET", "/inventory", self.headers)
         if response.status == 200:
             data = response.json()
-            logging.debug(f"Got player inventory data successfully: {data}. Returning with converting to Model.")
+            log_payload("Got player inventory data successfully: %s. Returning with converting to Model.", data)
             return {convert_str_to_IT(item_id): amount for item_id, amount in data["items"].items()}
         else:
             json = response.json()
@@ -76,7 +77,7 @@ class Client:
         response = self.request("GET", "/army", self.headers)
         if response.status == 200:
             data = response.json()
-            logging.debug(f"Got player army data successfully: {data}. Returning with converting to Model.")
+            log_payload("Got player army data successfully: %s. Returning with converting to Model.", data)
             return {convert_str_to_UT(unit_type): amount for unit_type, amount in data["units"].items()}
         else:
             json = response.json()
@@ -92,7 +93,7 @@ class Client:
         response = self.request("GET", "/outposts", self.headers)
         if response.status == 200:
             data = response.json()
-            logging.debug(f"Got outposts data successfully: {data}. Returning with converting to Model.")
+            log_payload("Got outposts data successfully: %s. Returning with converting to Model.", data)
             return [Outpost.from_data(outpost) for outpost in data["outposts"]]
         else:
             json = response.json()
@@ -114,7 +115,7 @@ class Client:
         if status == 400:
             raise NotInAlliance
         data = response.json()
-        logging.debug(f"Got alliance data successfully: {data}. Returning with converting to Model.")
+        log_payload("Got alliance data successfully: %s. Returning with converting to Model.", data)
         return Alliance.from_response(data)
 
     def update_alliance_name(self, new_name: str) -> bool:
@@ -199,7 +200,7 @@ class Client:
             json_data = response.json()
             if response != 200:
                 parse_error(json_data["detail"])
-            logging.debug(f"Got offer data for {item_id}: {str(json_data)}")
+            log_payload("Got offer data for %s: %s", item_id, json_data)
             number_of_orders = len(json_data["orders"])
             if number_of_orders == 0:
                 continue
@@ -228,13 +229,73 @@ class Client:
         }
         response = self.request("GET", "/market", headers=self.headers, params=params)
         json_data = response.json()
-        logging.debug(f"Got offer data for {item_id}: {str(json_data)}")
+        log_payload("Got offer data for %s: %s", item_id, json_data)
         if response.status_code != 200:
             parse_error(json_data["detail"])
         for order_uuid, order_data in json_data["orders"].items():
             offers.append(MarketOrder.from_response(order_uuid, order_data))
         return offers
 
+    def iter_offer(self, offer_type: Literal["buy", "sell"], item_id: str, chunk_size: int = 8192) -> Iterator[MarketOrder]:
+        """
+        Stream the offers for an item.
+
+        Unlike :meth:`get_offer`, the orders are decoded while the response is
+        still being downloaded and are yielded one at a time. Stopping the
+        iteration early closes the connection, for example
+        ``itertools.islice(client.iter_offer("sell", item_id), 10)``.
+
+        Parameters
+        ----------
+        offer_type: :class:`Literal["buy", "sell"]`
+            The type of offer to retrieve.
+        item_id: :class:`str`
+            The ID of the item to retrieve offers for.
+        chunk_size: :class:`int`
+            The number of bytes read from the connection at a time. Defaults to 8192.
+
+        Yields
+        ------
+        :class:`~willofsteel.types.MarketOrder`
+
+        """
+        if offer_type not in ["buy", "sell"]:
+            raise InvalidInput("offer_type")
+        params = {
+            "order_type": offer_type,
+            "item_type": item_id
+        }
+        response = self.request("GET", "/market", headers=self.headers, params=params, stream=True)
+        try:
+            if response.status != 200:
+                parse_error(response.json()["detail"])
+            logging.debug("Streaming offer data for %s.", item_id)
+            for order_uuid, order_data in iter_object_items(response.iter_content(chunk_size), "orders"):
+                yield MarketOrder.from_response(order_uuid, order_data)
+        finally:
+            response.close()
+
+    def iter_all_offers(self, offer_type: Literal["buy", "sell"], chunk_size: int = 8192) -> Iterator[MarketOrder]:
+        """
+        Stream all offers, one item after another.
+
+        Parameters
+        ----------
+        offer_type: :class:`Literal["buy", "sell"]`
+            The type of offer to retrieve.
+        chunk_size: :class:`int`
+            The number of bytes read from the connection at a time. Defaults to 8192.
+
+        Yields
+        ------
+        :class:`~willofsteel.types.MarketOrder`
+
+        """
+        if offer_type not in ["buy", "sell"]:
+            raise InvalidInput("offer_type")
+        for item_id in ALL_ITEMS:
+            yield from self.iter_offer(offer_type, item_id, chunk_size)
+
     def recruit_troop(self, unit_type: UnitType, amount: int, currency: Literal["gold", "silver"] = "gold") -> bool:
         """
         Recruit troops.
@@ -270,13 +331,16 @@ class Client:
             print(json["detail"])
             print("This error was not automatically detected, please report this to the maintainers (or fix it yourself)!")
 
-    def request(self, method: Literal["GET", "POST"], route: str, headers: dict, params: dict = None):
+    def request(self, method: Literal["GET", "POST"], route: str, headers: dict, params: dict = None, stream: bool = False):
         url = BASE + route
 
         if method not in ["GET", "POST"]:
             return KeyError("Invalid Method")
 
-        response = requests.request(method, url, headers=headers, params=params)
+        if self.session:
+            response = self.session.request(method, url, headers=headers, params=params, stream=stream)
+        else:
+            response = requests.request(method, url, headers=headers, params=params, stream=stream)
         response.status = response.status_code
         if response.status == 500:
             raise ServerError
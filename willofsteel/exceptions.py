@@ -28,4 +28,8 @@ class LimitExceeded(Exception):
 
 class InvalidKey(Exception):
     def __init__(self) -> None:
-        super().__init__("Invalid API Key. Please check the key and try again.")
\ No newline at end of file
+        super().__init__("Invalid API Key. Please check the key and try again.")
+
+class DeadlineExceeded(Exception):
+    def __init__(self, waited: float) -> None:
+        super().__init__(f"Request dropped after waiting {waited:.3f}s, its deadline has passed.")
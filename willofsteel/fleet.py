@@ -0,0 +1,212 @@
+"""
+WillofSteel API Wrapper
+~~~~~~~~~~~~~~~~~~~~~~~
+
+A wrapper for the Will of Steel API
+
+:copyright: (C) 2024-present ItsNeil
+:license: MIT, see LICENSE for more details
+
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterator, NamedTuple, Optional
+import logging
+import os
+import requests
+
+from .client import Client
+from .types import Player, UnitType, ItemType, LoggingObject
+from .constants import MISSING
+
+__all__ = (
+    "AccountResult",
+    "ShardProgress",
+    "FleetSnapshot",
+    "FleetScanner",
+)
+
+
+class AccountResult(NamedTuple):
+    api_key: str
+    player: Optional[Player]
+    army: Optional[dict[UnitType, int]]
+    inventory: Optional[dict[ItemType, int]]
+    error: Optional[str]
+
+
+class ShardProgress(NamedTuple):
+    shard: int
+    completed: int
+    total: int
+    errors: int
+
+
+class FleetSnapshot(NamedTuple):
+    players: dict[str, Player]
+    armies: dict[str, dict[UnitType, int]]
+    inventories: dict[str, dict[ItemType, int]]
+    errors: dict[str, str]
+    shards: dict[int, ShardProgress]
+
+
+# Per worker process state, created once by ``_init_worker`` and shared by
+# every account that worker scans.
+_worker_session: requests.Session = MISSING
+_worker_logger: LoggingObject = MISSING
+
+
+def _init_worker(log_level: int) -> None:
+    global _worker_session, _worker_logger
+    _worker_session = requests.Session()
+    # A single handler instance is reused so that building a Client per
+    # account does not keep attaching new handlers to the logger.
+    _worker_logger = LoggingObject(handler=logging.NullHandler(), level=log_level)
+
+
+def _scan_chunk(shard: int, api_keys: list[str]) -> tuple[int, list[tuple]]:
+    # Results are sent back as plain tuples with enum names instead of
+    # model instances, which keeps the pickled payload small.
+    results = []
+    for api_key in api_keys:
+        try:
+            client = Client(api_key, logger=_worker_logger, session=_worker_session)
+            player = client.get_player()
+            army = client.get_player_army()
+            inventory = client.get_player_inventory()
+        except Exception as error:
+            results.append((api_key, None, None, None, f"{type(error).__name__}: {error}"))
+            continue
+        results.append((
+            api_key,
+            tuple(player) if player is not None else None,
+            tuple((unit_type._name_, amount) for unit_type, amount in army.items()) if army is not None else None,
+            tuple((item_type._name_, amount) for item_type, amount in inventory.items()) if inventory is not None else None,
+            None,
+        ))
+    return shard, results
+
+
+def _load_result(data: tuple) -> AccountResult:
+    api_key, player, army, inventory, error = data
+    return AccountResult(
+        api_key=api_key,
+        player=Player._make(player) if player is not None else None,
+        army={UnitType[name]: amount for name, amount in army} if army is not None else None,
+        inventory={ItemType[name]: amount for name, amount in inventory} if inventory is not None else None,
+        error=error,
+    )
+
+
+class FleetScanner:
+    """
+    Scan many accounts in parallel across a pool of processes.
+
+    The API keys are split into shards, and each shard into chunks which are
+    handed to the worker processes. Every worker keeps one pooled
+    :class:`requests.Session` which is shared by the clients it builds.
+
+    Parameters
+    ----------
+    api_keys: list[:class:`str`]
+        The API keys of the accounts to scan.
+    processes: Optional[:class:`int`]
+        The number of worker processes. Defaults to the number of CPU cores.
+    chunk_size: :class:`int`
+        The number of accounts scanned by a worker before its results are
+        sent back. Defaults to 16.
+    log_level: :class:`int`
+        The log level used inside the worker processes. Defaults to ``logging.WARNING``.
+
+    """
+    def __init__(self, api_keys: list[str], processes: int = None, chunk_size: int = 16, log_level: int = logging.WARNING):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.api_keys = list(api_keys)
+        self.processes = max(1, min(processes or os.cpu_count() or 1, len(self.api_keys) or 1))
+        self.chunk_size = chunk_size
+        self.log_level = log_level
+
+    def _shards(self) -> list[list[str]]:
+        return [self.api_keys[shard::self.processes] for shard in range(self.processes)]
+
+    def iter_scan(self, on_progress: Callable[[ShardProgress], None] = None) -> Iterator[AccountResult]:
+        """
+        Scan the fleet, yielding results as soon as each chunk finishes.
+
+        Parameters
+        ----------
+        on_progress: Optional[Callable[[:class:`ShardProgress`], None]]
+            Called with the progress of a shard every time one of its chunks finishes.
+
+        """
+        shards = self._shards()
+        progress = {shard: ShardProgress(shard, 0, len(keys), 0) for shard, keys in enumerate(shards)}
+
+        with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker, initargs=(self.log_level,)) as executor:
+            chunks = {}
+            for shard, keys in enumerate(shards):
+                for start in range(0, len(keys), self.chunk_size):
+                    chunk = keys[start:start + self.chunk_size]
+                    chunks[executor.submit(_scan_chunk, shard, chunk)] = (shard, chunk)
+            try:
+                for future in as_completed(chunks):
+                    shard, keys = chunks[future]
+                    try:
+                        _, results = future.result()
+                    except Exception as error:
+                        # A crashed worker or a result that could not be sent
+                        # back only fails the accounts of this chunk.
+                        message = f"{type(error).__name__}: {error}"
+                        results = [(api_key, None, None, None, message) for api_key in keys]
+
+                    errors = 0
+                    for data in results:
+                        result = _load_result(data)
+                        if result.error is not None:
+                            errors += 1
+                        yield result
+
+                    current = progress[shard]
+                    progress[shard] = current._replace(completed=current.completed + len(results), errors=current.errors + errors)
+                    logging.debug("Fleet shard %s: %s/%s accounts scanned", shard, progress[shard].completed, progress[shard].total)
+                    if on_progress is not None:
+                        on_progress(progress[shard])
+            finally:
+                # If the caller stopped early, don't scan the rest of the fleet
+                # while the executor shuts down.
+                for future in chunks:
+                    future.cancel()
+
+    def scan(self, on_progress: Callable[[ShardProgress], None] = None) -> FleetSnapshot:
+        """
+        Scan the fleet and combine the results into one snapshot.
+
+        Parameters
+        ----------
+        on_progress: Optional[Callable[[:class:`ShardProgress`], None]]
+            Called with the progress of a shard every time one of its chunks finishes.
+
+        Returns
+        -------
+        :class:`FleetSnapshot`
+
+        """
+        snapshot = FleetSnapshot(players={}, armies={}, inventories={}, errors={}, shards={})
+
+        def track(progress: ShardProgress) -> None:
+            snapshot.shards[progress.shard] = progress
+            if on_progress is not None:
+                on_progress(progress)
+
+        for result in self.iter_scan(on_progress=track):
+            if result.error is not None:
+                snapshot.errors[result.api_key] = result.error
+                continue
+            if result.player is not None:
+                snapshot.players[result.api_key] = result.player
+            if result.army is not None:
+                snapshot.armies[result.api_key] = result.army
+            if result.inventory is not None:
+                snapshot.inventories[result.api_key] = result.inventory
+        return snapshot
@@ -0,0 +1,302 @@
+"""
+WillofSteel API Wrapper
+~~~~~~~~~~~~~~~~~~~~~~~
+
+A wrapper for the Will of Steel API
+
+:copyright: (C) 2024-present ItsNeil
+:license: MIT, see LICENSE for more details
+
+"""
+from __future__ import annotations
+from concurrent.futures import Future
+from enum import IntEnum
+from itertools import count
+from math import inf
+from typing import Any, Callable, NamedTuple, Optional
+import heapq
+import logging
+import threading
+import time
+
+from .exceptions import DeadlineExceeded
+
+__all__ = (
+    "Priority",
+    "PriorityStats",
+    "RequestScheduler",
+)
+
+
+class Priority(IntEnum):
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    BULK = 3
+
+
+class PriorityStats(NamedTuple):
+    queued: int
+    started: int
+    dropped: int
+    average_wait: float
+    max_wait: float
+
+
+class _Job(NamedTuple):
+    future: Future
+    func: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    priority: Priority
+    deadline: float
+    submitted_at: float
+    sequence: int
+
+
+class _Counters:
+    __slots__ = ("queued", "started", "dropped", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.queued = 0
+        self.started = 0
+        self.dropped = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class RequestScheduler:
+    """
+    Run client calls on a pool of threads in order of priority.
+
+    Jobs are picked by :class:`Priority` first and by the earliest deadline
+    within a priority. A job which is still queued when its deadline passes
+    is dropped without being run, and its future raises
+    :exc:`DeadlineExceeded`.
+
+    .. code:: py
+
+        scheduler = willofsteel.RequestScheduler(workers=4, rate=10)
+        scheduler.submit(client.get_player_army, priority=willofsteel.Priority.BULK, deadline=30)
+        future = scheduler.submit(client.recruit_troop, UnitType.INFANTRY, 10, priority=willofsteel.Priority.CRITICAL)
+        future.result()
+
+    Parameters
+    ----------
+    workers: :class:`int`
+        The number of jobs that can run at the same time. Defaults to 4.
+    rate: Optional[:class:`float`]
+        The maximum number of jobs started per second. Defaults to no limit.
+
+    """
+    def __init__(self, workers: int = 4, rate: float = None):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.rate = rate
+        self._interval = 1 / rate if rate else 0.0
+        self._next_start = 0.0
+        # Jobs are removed from the heaps lazily, ``_pending`` holds the
+        # jobs which are still queued by sequence number.
+        self._heap: list[tuple[int, float, int, _Job]] = []
+        self._deadlines: list[tuple[float, int, _Job]] = []
+        self._pending: dict[int, _Job] = {}
+        self._sequence = count()
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._reaper_condition = threading.Condition(self._lock)
+        self._closed = False
+        self._counters = {priority: _Counters() for priority in Priority}
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"willofsteel-scheduler-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        self._threads.append(threading.Thread(target=self._reaper, name="willofsteel-scheduler-reaper", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> RequestScheduler:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def submit(self, func: Callable[..., Any], *args: Any, priority: Priority = Priority.NORMAL, deadline: float = None, **kwargs: Any) -> Future:
+        """
+        Queue a call, such as a :class:`Client` method.
+
+        Parameters
+        ----------
+        func: Callable
+            The function to call with ``args`` and ``kwargs``.
+        priority: :class:`Priority`
+            The priority of the call. Defaults to ``Priority.NORMAL``.
+        deadline: Optional[:class:`float`]
+            The number of seconds the call may wait in the queue before it is
+            dropped. Defaults to no deadline.
+
+        Returns
+        -------
+        :class:`concurrent.futures.Future`
+
+        """
+        priority = Priority(priority)
+        now = time.monotonic()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a closed scheduler")
+            sequence = next(self._sequence)
+            job = _Job(Future(), func, args, kwargs, priority, now + deadline if deadline is not None else inf, now, sequence)
+            self._pending[sequence] = job
+            heapq.heappush(self._heap, (priority, job.deadline, sequence, job))
+            self._counters[priority].queued += 1
+            self._condition.notify()
+            if deadline is not None:
+                heapq.heappush(self._deadlines, (job.deadline, sequence, job))
+                self._reaper_condition.notify()
+        return job.future
+
+    def _expire(self, now: float) -> list[_Job]:
+        # The only place deadlines are checked. Must be called with the lock
+        # held, the returned jobs are resolved by _drop once it is released.
+        expired = []
+        while self._deadlines and self._deadlines[0][0] < now:
+            _, sequence, job = heapq.heappop(self._deadlines)
+            if self._pending.pop(sequence, None) is None:
+                continue
+            counters = self._counters[job.priority]
+            counters.queued -= 1
+            counters.dropped += 1
+            expired.append(job)
+        if not self._pending:
+            self._heap.clear()
+            self._deadlines.clear()
+        return expired
+
+    @staticmethod
+    def _drop(jobs: list[_Job], now: float) -> None:
+        for job in jobs:
+            waited = now - job.submitted_at
+            logging.debug("Dropped %s job after waiting %.3fs, its deadline has passed.", job.priority.name, waited)
+            if job.future.set_running_or_notify_cancel():
+                job.future.set_exception(DeadlineExceeded(waited))
+
+    def _reaper(self) -> None:
+        while True:
+            with self._reaper_condition:
+                if self._closed and not self._pending:
+                    return
+                now = time.monotonic()
+                expired = self._expire(now)
+                if not expired:
+                    timeout = self._deadlines[0][0] - now if self._deadlines else None
+                    self._reaper_condition.wait(timeout)
+                    continue
+            self._drop(expired, now)
+
+    def _next_job(self) -> Optional[_Job]:
+        expired = []
+        try:
+            with self._condition:
+                while True:
+                    now = time.monotonic()
+                    expired += self._expire(now)
+                    if not self._pending:
+                        if self._closed:
+                            self._reaper_condition.notify()
+                            return None
+                        self._condition.wait()
+                        continue
+                    if self._next_start > now:
+                        # Wait for the rate limit, then look at the queue again in
+                        # case something more urgent arrived in the meantime.
+                        self._condition.wait(self._next_start - now)
+                        continue
+                    *_, job = heapq.heappop(self._heap)
+                    if self._pending.pop(job.sequence, None) is None:
+                        continue
+                    self._counters[job.priority].queued -= 1
+                    self._next_start = max(self._next_start, now) + self._interval
+                    return job
+        finally:
+            self._drop(expired, time.monotonic())
+
+    def _worker(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            waited = time.monotonic() - job.submitted_at
+            with self._condition:
+                counters = self._counters[job.priority]
+                counters.started += 1
+                counters.total_wait += waited
+                counters.max_wait = max(counters.max_wait, waited)
+            try:
+                result = job.func(*job.args, **job.kwargs)
+            except BaseException as error:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of jobs waiting to be run.
+
+        """
+        with self._condition:
+            return len(self._pending)
+
+    def stats(self) -> dict[Priority, PriorityStats]:
+        """
+        The queue depth and wait times of every priority.
+
+        ``started`` counts the jobs that were run, and the wait times
+        are measured from submitting a job until it started.
+
+        Returns
+        -------
+        dict[:class:`Priority`, :class:`PriorityStats`]
+
+        """
+        with self._condition:
+            return {
+                priority: PriorityStats(
+                    queued=counters.queued,
+                    started=counters.started,
+                    dropped=counters.dropped,
+                    average_wait=counters.total_wait / counters.started if counters.started else 0.0,
+                    max_wait=counters.max_wait,
+                )
+                for priority, counters in self._counters.items()
+            }
+
+    def close(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stop accepting jobs and shut the workers down once the queue is empty.
+
+        Parameters
+        ----------
+        wait: :class:`bool`
+            Whether to block until the workers have finished. Defaults to ``True``.
+        cancel_pending: :class:`bool`
+            Whether to cancel the jobs that have not started yet. Defaults to ``False``.
+
+        """
+        with self._condition:
+            self._closed = True
+            if cancel_pending:
+                for job in self._pending.values():
+                    self._counters[job.priority].queued -= 1
+                    job.future.cancel()
+                self._pending.clear()
+                self._heap.clear()
+                self._deadlines.clear()
+            self._condition.notify_all()
+            self._reaper_condition.notify()
+        if wait:
+            for thread in self._threads:
+                thread.join()
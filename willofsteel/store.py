@@ -0,0 +1,319 @@
+"""
+WillofSteel API Wrapper
+~~~~~~~~~~~~~~~~~~~~~~~
+
+A wrapper for the Will of Steel API
+
+:copyright: (C) 2024-present ItsNeil
+:license: MIT, see LICENSE for more details
+
+"""
+from __future__ import annotations
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+from math import inf
+from typing import Hashable, Optional
+
+from .types import Player, Alliance, Outpost, UnitType, ItemType
+from .fleet import FleetSnapshot
+from .exceptions import InvalidInput
+
+__all__ = (
+    "FleetStore",
+)
+
+PLAYER_FIELDS = ("gold", "ruby", "silver", "npc_level", "votes", "queue_slots", "food_stored", "prestige")
+
+
+class _SortedIndex:
+    __slots__ = ("entries", "total")
+
+    def __init__(self):
+        self.entries: list[tuple[int, int]] = []
+        self.total = 0
+
+    def add(self, value: int, account_id: int) -> None:
+        insort(self.entries, (value, account_id))
+        self.total += value
+
+    def remove(self, value: int, account_id: int) -> None:
+        del self.entries[bisect_left(self.entries, (value, account_id))]
+        self.total -= value
+
+    def bounds(self, low: Optional[int], high: Optional[int]) -> tuple[int, int]:
+        start = 0 if low is None else bisect_left(self.entries, (low, -inf))
+        end = len(self.entries) if high is None else bisect_right(self.entries, (high, inf))
+        return start, max(start, end)
+
+    def ids(self, low: Optional[int], high: Optional[int]) -> list[int]:
+        start, end = self.bounds(low, high)
+        return [account_id for _, account_id in self.entries[start:end]]
+
+
+class FleetStore:
+    """
+    An in-memory store of the state of many accounts.
+
+    Results of :class:`Client` calls are fed in per account, and the store
+    keeps sorted indexes on the numeric :class:`~willofsteel.types.Player`
+    fields and on every :class:`~willofsteel.types.UnitType` and
+    :class:`~willofsteel.types.ItemType` count, together with running
+    totals. Updating an account only touches the entries of that account.
+
+    Units and items missing from an army or inventory are indexed with a
+    count of 0, so range queries with a ``low`` of 0 include the accounts
+    without them.
+
+    Accounts can be identified by any hashable value, such as the API key
+    or the player ID.
+
+    """
+    def __init__(self):
+        self._next_id = count()
+        self._ids: dict[Hashable, int] = {}
+        self._accounts: dict[int, Hashable] = {}
+
+        self._players: dict[int, Player] = {}
+        self._alliances: dict[int, Alliance] = {}
+        self._outposts: dict[int, list[Outpost]] = {}
+        self._armies: dict[int, dict[UnitType, int]] = {}
+        self._inventories: dict[int, dict[ItemType, int]] = {}
+
+        self._player_index = {field: _SortedIndex() for field in PLAYER_FIELDS}
+        self._unit_index = {unit_type: _SortedIndex() for unit_type in UnitType}
+        self._item_index = {item_type: _SortedIndex() for item_type in ItemType}
+        self._alliance_index: dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, account: Hashable) -> bool:
+        return account in self._ids
+
+    def _account_id(self, account: Hashable) -> int:
+        account_id = self._ids.get(account)
+        if account_id is None:
+            account_id = self._ids[account] = next(self._next_id)
+            self._accounts[account_id] = account
+        return account_id
+
+    # Updates
+
+    def update_player(self, account: Hashable, player: Player) -> None:
+        """
+        Store the result of :meth:`Client.get_player` for an account.
+
+        """
+        for field in PLAYER_FIELDS:
+            if not isinstance(getattr(player, field), int):
+                raise InvalidInput(field)
+
+        account_id = self._account_id(account)
+        old = self._players.get(account_id)
+        for field, index in self._player_index.items():
+            if old is not None:
+                index.remove(getattr(old, field), account_id)
+            index.add(getattr(player, field), account_id)
+        self._players[account_id] = player
+
+    def update_army(self, account: Hashable, army: dict[UnitType, int]) -> None:
+        """
+        Store the result of :meth:`Client.get_player_army` for an account.
+
+        """
+        account_id = self._account_id(account)
+        self._replace_counts(self._unit_index, self._armies.get(account_id), army, account_id)
+        self._armies[account_id] = dict(army)
+
+    def update_inventory(self, account: Hashable, inventory: dict[ItemType, int]) -> None:
+        """
+        Store the result of :meth:`Client.get_player_inventory` for an account.
+
+        """
+        account_id = self._account_id(account)
+        self._replace_counts(self._item_index, self._inventories.get(account_id), inventory, account_id)
+        self._inventories[account_id] = dict(inventory)
+
+    def update_alliance(self, account: Hashable, alliance: Optional[Alliance]) -> None:
+        """
+        Store the result of :meth:`Client.get_alliance` for an account.
+        Pass ``None`` if the account is not in an alliance.
+
+        """
+        self._set_alliance(self._account_id(account), alliance)
+
+    def _set_alliance(self, account_id: int, alliance: Optional[Alliance]) -> None:
+        old = self._alliances.pop(account_id, None)
+        if old is not None:
+            members = self._alliance_index[old.name]
+            members.discard(account_id)
+            if not members:
+                del self._alliance_index[old.name]
+        if alliance is not None:
+            self._alliances[account_id] = alliance
+            self._alliance_index.setdefault(alliance.name, set()).add(account_id)
+
+    def update_outposts(self, account: Hashable, outposts: list[Outpost]) -> None:
+        """
+        Store the result of :meth:`Client.get_outposts` for an account.
+
+        """
+        self._outposts[self._account_id(account)] = list(outposts)
+
+    def ingest(self, snapshot: FleetSnapshot) -> None:
+        """
+        Store every result of a :class:`FleetSnapshot`, keyed by API key.
+
+        """
+        for api_key, player in snapshot.players.items():
+            self.update_player(api_key, player)
+        for api_key, army in snapshot.armies.items():
+            self.update_army(api_key, army)
+        for api_key, inventory in snapshot.inventories.items():
+            self.update_inventory(api_key, inventory)
+
+    def remove(self, account: Hashable) -> None:
+        """
+        Remove an account and all of its data from the store.
+
+        """
+        account_id = self._ids[account]
+        self._set_alliance(account_id, None)
+        del self._ids[account]
+        del self._accounts[account_id]
+        player = self._players.pop(account_id, None)
+        if player is not None:
+            for field, index in self._player_index.items():
+                index.remove(getattr(player, field), account_id)
+        self._replace_counts(self._unit_index, self._armies.pop(account_id, None), None, account_id)
+        self._replace_counts(self._item_index, self._inventories.pop(account_id, None), None, account_id)
+        self._outposts.pop(account_id, None)
+
+    @staticmethod
+    def _replace_counts(indexes: dict, old: Optional[dict], new: Optional[dict], account_id: int) -> None:
+        # Every type is indexed for an account with an army or inventory,
+        # types the API left out count as 0.
+        for key, index in indexes.items():
+            old_amount = old.get(key, 0) if old is not None else None
+            new_amount = new.get(key, 0) if new is not None else None
+            if old_amount == new_amount:
+                continue
+            if old_amount is not None:
+                index.remove(old_amount, account_id)
+            if new_amount is not None:
+                index.add(new_amount, account_id)
+
+    # Lookups
+
+    def player(self, account: Hashable) -> Optional[Player]:
+        return self._players.get(self._ids.get(account))
+
+    def army(self, account: Hashable) -> Optional[dict[UnitType, int]]:
+        return self._armies.get(self._ids.get(account))
+
+    def inventory(self, account: Hashable) -> Optional[dict[ItemType, int]]:
+        return self._inventories.get(self._ids.get(account))
+
+    def alliance(self, account: Hashable) -> Optional[Alliance]:
+        return self._alliances.get(self._ids.get(account))
+
+    def outposts(self, account: Hashable) -> Optional[list[Outpost]]:
+        return self._outposts.get(self._ids.get(account))
+
+    # Queries
+
+    def total(self, field: str) -> int:
+        """
+        The sum of a numeric :class:`~willofsteel.types.Player` field across the fleet.
+
+        """
+        if field not in self._player_index:
+            raise InvalidInput(field)
+        return self._player_index[field].total
+
+    def total_units(self, unit_type: UnitType) -> int:
+        """
+        The number of units of a type across the fleet.
+
+        """
+        index = self._unit_index.get(unit_type)
+        return index.total if index is not None else 0
+
+    def total_items(self, item_type: ItemType) -> int:
+        """
+        The number of items of a type across the fleet.
+
+        """
+        index = self._item_index.get(item_type)
+        return index.total if index is not None else 0
+
+    def with_units(self, unit_type: UnitType, low: int = None, high: int = None) -> list[Hashable]:
+        """
+        The accounts with between ``low`` and ``high`` (inclusive) units of a type.
+
+        """
+        index = self._unit_index.get(unit_type)
+        if index is None:
+            return []
+        return [self._accounts[account_id] for account_id in index.ids(low, high)]
+
+    def with_items(self, item_type: ItemType, low: int = None, high: int = None) -> list[Hashable]:
+        """
+        The accounts with between ``low`` and ``high`` (inclusive) items of a type.
+
+        """
+        index = self._item_index.get(item_type)
+        if index is None:
+            return []
+        return [self._accounts[account_id] for account_id in index.ids(low, high)]
+
+    def find(self, alliance: str = None, **ranges: tuple[Optional[int], Optional[int]]) -> list[Hashable]:
+        """
+        Find the accounts whose players match every given condition.
+
+        Each keyword is a numeric :class:`~willofsteel.types.Player` field
+        mapped to an inclusive ``(low, high)`` range, where either bound may
+        be ``None``. The most selective index is used to pick the
+        candidates, which are then checked against the other conditions.
+
+        For example, ``store.find(alliance="Knights", queue_slots=(1, None))``.
+
+        Parameters
+        ----------
+        alliance: Optional[:class:`str`]
+            Only include accounts in the alliance with this name.
+
+        Returns
+        -------
+        list[Hashable]
+
+        """
+        for field in ranges:
+            if field not in self._player_index:
+                raise InvalidInput(field)
+
+        candidates = None
+        if alliance is not None:
+            candidates = self._alliance_index.get(alliance, set())
+        if ranges:
+            bounds = {field: self._player_index[field].bounds(*ranges[field]) for field in ranges}
+            field = min(bounds, key=lambda name: bounds[name][1] - bounds[name][0])
+            start, end = bounds[field]
+            if candidates is None or end - start < len(candidates):
+                candidates = [account_id for _, account_id in self._player_index[field].entries[start:end]]
+        if candidates is None:
+            candidates = self._players
+
+        results = []
+        for account_id in candidates:
+            player = self._players.get(account_id)
+            if player is None:
+                continue
+            if alliance is not None and account_id not in self._alliance_index.get(alliance, ()):
+                continue
+            if all(
+                (low is None or getattr(player, field) >= low) and (high is None or getattr(player, field) <= high)
+                for field, (low, high) in ranges.items()
+            ):
+                results.append(self._accounts[account_id])
+        return results
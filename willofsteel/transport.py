@@ -0,0 +1,176 @@
+"""
+WillofSteel API Wrapper
+~~~~~~~~~~~~~~~~~~~~~~~
+
+A wrapper for the Will of Steel API
+
+:copyright: (C) 2024-present ItsNeil
+:license: MIT, see LICENSE for more details
+
+"""
+from __future__ import annotations
+from typing import Any, Iterator, Literal, NamedTuple
+import json
+import threading
+
+from .constants import BASE, MISSING
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+__all__ = (
+    "TransportStats",
+    "HTTP2Transport",
+)
+
+
+def _supported_encodings() -> list[str]:
+    encodings = ["gzip", "deflate"]
+    try:
+        import brotli  # noqa: F401
+        encodings.insert(0, "br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.insert(0, "br")
+        except ImportError:
+            pass
+    try:
+        import zstandard  # noqa: F401
+        encodings.insert(0, "zstd")
+    except ImportError:
+        pass
+    return encodings
+
+
+class TransportStats(NamedTuple):
+    requests: int
+    bytes_received: int
+    bytes_decoded: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_decoded - self.bytes_received
+
+
+class HTTP2Response:
+    """
+    A response returned by :class:`HTTP2Transport`.
+
+    It exposes the parts of :class:`requests.Response` used by the
+    :class:`Client`, so it can be used in its place.
+
+    """
+    def __init__(self, response: httpx.Response, transport: HTTP2Transport):
+        self._response = response
+        self._transport = transport
+        self._recorded = False
+        self._decoded = 0
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.http_version = response.http_version
+
+    def _record(self) -> None:
+        if not self._recorded:
+            self._recorded = True
+            self._transport._record(self._response.num_bytes_downloaded, self._decoded)
+
+    def read(self) -> bytes:
+        content = self._response.read()
+        self._decoded = len(content)
+        self._record()
+        return content
+
+    @property
+    def content(self) -> bytes:
+        return self.read()
+
+    def json(self) -> Any:
+        return json.loads(self.read())
+
+    def iter_content(self, chunk_size: int = None) -> Iterator[bytes]:
+        self._decoded = 0
+        for chunk in self._response.iter_bytes(chunk_size):
+            self._decoded += len(chunk)
+            yield chunk
+        self._record()
+
+    def close(self) -> None:
+        # Streams which were stopped early are still counted with the
+        # bytes read so far.
+        self._record()
+        self._response.close()
+
+
+class HTTP2Transport:
+    """
+    An HTTP/2 transport which can be passed to :class:`Client` as ``session``.
+
+    All requests share one multiplexed connection per host, so many
+    threads can make requests at the same time without opening a socket
+    each. Responses are requested compressed with every encoding that is
+    installed (gzip and deflate always, brotli and zstd when available).
+
+    This requires the ``http2`` extra: ``pip install willofsteel[http2]``.
+
+    Parameters
+    ----------
+    base_url: Optional[:class:`str`]
+        Send the requests to this URL instead of the API, such as a local
+        h2 server used for testing.
+    **kwargs
+        Passed to :class:`httpx.Client`, for example ``verify`` or ``timeout``.
+        Pass ``http1=False`` to use HTTP/2 with a cleartext ``http://`` server.
+
+    """
+    def __init__(self, base_url: str = MISSING, **kwargs):
+        if httpx is None:
+            raise RuntimeError("httpx is required for HTTP/2 support. Install it with: pip install willofsteel[http2]")
+        self.base_url = base_url
+        self.encodings = _supported_encodings()
+        kwargs.setdefault("http2", True)
+        self._client = httpx.Client(headers={"Accept-Encoding": ", ".join(self.encodings)}, **kwargs)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._bytes_received = 0
+        self._bytes_decoded = 0
+
+    def __enter__(self) -> HTTP2Transport:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _record(self, received: int, decoded: int) -> None:
+        with self._lock:
+            self._requests += 1
+            self._bytes_received += received
+            self._bytes_decoded += decoded
+
+    @property
+    def stats(self) -> TransportStats:
+        """
+        The number of requests made and the bytes received on the wire
+        and after decompression.
+
+        Returns
+        -------
+        :class:`TransportStats`
+
+        """
+        with self._lock:
+            return TransportStats(self._requests, self._bytes_received, self._bytes_decoded)
+
+    def request(self, method: Literal["GET", "POST"], url: str, headers: dict = None, params: dict = None, stream: bool = False) -> HTTP2Response:
+        if self.base_url and url.startswith(BASE):
+            url = self.base_url + url[len(BASE):]
+        request = self._client.build_request(method, url, headers=headers, params=params)
+        response = HTTP2Response(self._client.send(request, stream=stream), self)
+        if not stream:
+            response.read()
+        return response
+
+    def close(self) -> None:
+        self._client.close()
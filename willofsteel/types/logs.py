@@ -8,3 +8,5 @@ class LoggingObject(NamedTuple):
     formatter: logging.Formatter = MISSING
     level: int = MISSING
     root: bool = True
+    queue: bool = False
+    payload_sample_rate: int = 1
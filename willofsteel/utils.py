@@ -1,7 +1,14 @@
+import atexit
+import codecs
+import itertools
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import re
 import sys
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from .exceptions import *
 from .constants import MISSING
@@ -29,7 +36,101 @@ def parse_error(error: str):
     else:
         logging.error("This error was not automatically detected, please report this to the maintainers (or fix it yourself)! " + error)
         raise ErrorNotDetected()
-    
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters which can still extend a number, up to the end of the buffer.
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*\Z")
+
+def iter_object_items(chunks: Iterable[bytes], key: str) -> Iterator[tuple[str, Any]]:
+    """Incrementally decode the object stored under ``key`` in a JSON document.
+
+    The document is read from ``chunks`` and the items of the object are
+    yielded as soon as each of them has been received, so only the part of
+    the document that has not been decoded yet is kept in memory.
+    """
+    chunks = iter(chunks)
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+
+    def fill() -> bool:
+        nonlocal buffer, pos
+        for chunk in chunks:
+            text = utf8.decode(chunk)
+            if text:
+                buffer = buffer[pos:] + text
+                pos = 0
+                return True
+        return False
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                raise json.JSONDecodeError("Unexpected end of document", buffer, pos)
+
+    def expect(char: str) -> None:
+        nonlocal pos
+        if peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", buffer, pos)
+        pos += 1
+
+    def decode() -> Any:
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A number is only complete once something other than a digit,
+            # ".", "e", "E", "+" or "-" follows it, or the document has ended.
+            # Until then the next chunk may continue it ("1." + "25").
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and _NUMBER_TAIL.match(buffer, end) and fill():
+                continue
+            pos = end
+            return value
+
+    def items() -> Iterator[tuple[str, Any]]:
+        nonlocal pos
+        expect("{")
+        if peek() == "}":
+            pos += 1
+            return
+        while True:
+            name = decode()
+            expect(":")
+            yield name, decode()
+            if peek() == ",":
+                pos += 1
+            else:
+                expect("}")
+                return
+
+    if not fill():
+        raise json.JSONDecodeError("Empty document", buffer, pos)
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        name = decode()
+        expect(":")
+        if name == key:
+            yield from items()
+            return
+        decode()
+        if peek() == ",":
+            pos += 1
+        else:
+            expect("}")
+            return
+
 """Logging code taken from https://github.com/Rapptz/discord.py/tree/main/discord/utils.py#L1262"""
 def is_docker() -> bool:
     path = '/proc/self/cgroup'
@@ -94,6 +195,41 @@ class _ColourFormatter(logging.Formatter):
         record.exc_text = None
         return output
     
+class _QueueHandler(logging.handlers.QueueHandler):
+    # The default implementation formats the record on the calling thread.
+    # Records never leave the process here, so they are passed on as they are
+    # and formatted by the listener's handler instead.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# logger -> (config, handler, listener) installed on it by setup_logging.
+_installed: dict[logging.Logger, tuple] = {}
+_payload_sample_rate = 1
+_payload_counter = itertools.count()
+
+
+def _stop_listeners() -> None:
+    for _, _, listener in _installed.values():
+        if listener is not None:
+            listener.stop()
+
+atexit.register(_stop_listeners)
+
+
+def log_payload(message: str, *args: Any) -> None:
+    """Log a response payload at ``DEBUG`` level.
+
+    The message is only formatted when ``DEBUG`` is enabled and the payload
+    is picked by the sample rate set through :func:`setup_logging`.
+    """
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+    if _payload_sample_rate > 1 and next(_payload_counter) % _payload_sample_rate:
+        return
+    logging.debug(message, *args)
+
+
 def setup_logging(
     logger: LoggingObject
 ) -> None:
@@ -123,8 +259,35 @@ def setup_logging(
     root: :class:`bool`
         Whether to set up the root logger rather than the library logger.
         Unlike the default for :class:`~discord.Client`, this defaults to ``True``.
+    queue: :class:`bool`
+        Whether to format and emit records on a background thread through a
+        :class:`logging.handlers.QueueListener`. Defaults to ``False``.
+    payload_sample_rate: :class:`int`
+        Only log one in every ``payload_sample_rate`` response payloads at
+        ``DEBUG`` level. Defaults to ``1``.
+
+    Calling this again with the same configuration does nothing, so the
+    handler is only installed once however many clients are created.
+    Calling it with a different configuration for the same logger replaces
+    the handler installed before, so every client logs through the most
+    recent configuration. The root and library loggers are configured
+    independently. ``payload_sample_rate`` applies to the whole library.
     """
-    level, handler, formatter, root = logger.level, logger.handler, logger.formatter, logger.root
+    global _payload_sample_rate
+
+    config = logger
+    if config.root:
+        logger = logging.getLogger()
+    else:
+        library, _, _ = __name__.partition('.')
+        logger = logging.getLogger(library)
+
+    previous = _installed.get(logger)
+    if previous is not None and previous[0] == config:
+        return
+    _payload_sample_rate = max(1, config.payload_sample_rate)
+
+    level, handler, formatter = config.level, config.handler, config.formatter
 
     if level is MISSING:
         level = logging.INFO
@@ -139,13 +302,23 @@ def setup_logging(
             dt_fmt = '%Y-%m-%d %H:%M:%S'
             formatter = logging.Formatter('[{asctime}] [{levelname:<8}] {name}: {message}', dt_fmt, style='{')
 
-    if root:
-        logger = logging.getLogger()
-    else:
-        library, _, _ = __name__.partition('.')
-        logger = logging.getLogger(library)
-
     handler.setFormatter(formatter)
+
+    listener = None
+    if config.queue:
+        listener = logging.handlers.QueueListener(queue.SimpleQueue(), handler, respect_handler_level=True)
+        handler = _QueueHandler(listener.queue)
+        listener.start()
+
+    if previous is not None:
+        _, previous_handler, previous_listener = previous
+        logger.removeHandler(previous_handler)
+        if previous_listener is not None:
+            previous_listener.stop()
+    _installed[logger] = (config, handler, listener)
+
     logger.setLevel(level)
     logger.addHandler(handler)
-    logging.getLogger("urllib3").setLevel(logging.WARNING) # disable DEBUG logs from requests lib
\ No newline at end of file
+    logging.getLogger("urllib3").setLevel(logging.WARNING) # disable DEBUG logs from requests lib
+    logging.getLogger("httpx").setLevel(logging.WARNING) # and from the HTTP/2 transport
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
\ No newline at end of file